@@ -12,6 +12,7 @@ jest.mock('ccxt', () => ({
 
 // Mock Backtester
 jest.mock('../trading/Backtester', () => ({
+  TIMEFRAME_MS: jest.requireActual<typeof import('../trading/Backtester')>('../trading/Backtester').TIMEFRAME_MS,
   Backtester: jest.fn().mockImplementation(() => ({
     loadData: jest.fn(),
     startBacktest: jest.fn()
@@ -137,6 +138,42 @@ describe('BacktestController', () => {
       });
     });
 
+    it('should fall back to the default strategy for unknown names', async () => {
+      const mockExchange = (controller as any).exchange;
+      mockExchange.fetchOHLCV.mockResolvedValue([
+        [1704326400000, 42000, 42500, 41500, 42200, 1000]
+      ]);
+
+      const { Backtester } = require('../trading/Backtester');
+      Backtester.mockImplementation(() => ({
+        loadData: jest.fn(),
+        startBacktest: jest.fn().mockResolvedValue({ totalReturn: 0 })
+      }));
+
+      mockReq.body.startDate = '2024-01-04T00:00:00Z';
+      mockReq.body.endDate = '2024-01-05T00:00:00Z';
+
+      for (const strategyName of ['__proto__', 'hasOwnProperty', 'toString', 'constructor']) {
+        mockReq.body.strategyName = strategyName;
+        await controller.runBacktest(mockReq, mockRes);
+
+        const [config] = Backtester.mock.calls[Backtester.mock.calls.length - 1];
+        expect(config.strategy.name).toBe('Multi-Indicator Confluence Strategy');
+      }
+      expect(mockRes.status).not.toHaveBeenCalled();
+    });
+
+    it('should reject ranges that exceed the candle limit', async () => {
+      mockReq.body.timeframe = '1m';
+      mockReq.body.startDate = '2024-01-01T00:00:00Z';
+      mockReq.body.endDate = '2024-03-31T00:00:00Z'; // 90 days = 129,600 one-minute candles
+
+      await controller.runBacktest(mockReq, mockRes);
+
+      expect(mockRes.status).toHaveBeenCalledWith(400);
+      expect((controller as any).exchange.fetchOHLCV).not.toHaveBeenCalled();
+    });
+
     it('should return error when no historical data is available', async () => {
       const mockExchange = (controller as any).exchange;
       mockExchange.fetchOHLCV.mockResolvedValue([]);
@@ -163,6 +200,147 @@ describe('BacktestController', () => {
     });
   });
 
+  describe('runBacktestBatch', () => {
+    it('should run each request and report per-entry failures', async () => {
+      const mockExchange = (controller as any).exchange;
+      mockExchange.fetchOHLCV.mockResolvedValue([
+        [1704153600000, 42000, 42500, 41500, 42200, 1000],
+        [1704154200000, 42200, 42800, 41800, 42600, 1200]
+      ]);
+
+      const { Backtester } = require('../trading/Backtester');
+      Backtester.mockImplementation(() => ({
+        loadData: jest.fn(),
+        startBacktest: jest.fn().mockResolvedValue({ totalReturn: 250 })
+      }));
+
+      mockReq.body = {
+        requests: [
+          { ...mockReq.body, startDate: '2024-01-02T00:00:00Z', endDate: '2024-01-03T00:00:00Z' },
+          { ...mockReq.body, startDate: '2024-01-03T00:00:00Z', endDate: '2024-01-02T00:00:00Z' }
+        ]
+      };
+
+      await controller.runBacktestBatch(mockReq, mockRes);
+
+      expect(mockRes.json).toHaveBeenCalledWith(
+        expect.objectContaining({
+          results: [
+            { success: true, result: expect.objectContaining({ totalReturn: 250, symbol: 'BTC/USDT' }) },
+            { success: false, status: 400, error: 'Start date must be before end date' }
+          ]
+        })
+      );
+    });
+
+    it('should mask unexpected entry errors', async () => {
+      const mockExchange = (controller as any).exchange;
+      mockExchange.fetchOHLCV.mockResolvedValue([
+        [1704240000000, 42000, 42500, 41500, 42200, 1000]
+      ]);
+
+      const { Backtester } = require('../trading/Backtester');
+      Backtester.mockImplementation(() => ({
+        loadData: jest.fn(),
+        startBacktest: jest.fn().mockRejectedValue(new TypeError('Cannot read properties of undefined'))
+      }));
+
+      mockReq.body = {
+        requests: [{ ...mockReq.body, startDate: '2024-01-03T00:00:00Z', endDate: '2024-01-04T00:00:00Z' }]
+      };
+
+      await controller.runBacktestBatch(mockReq, mockRes);
+
+      expect(mockRes.json).toHaveBeenCalledWith(
+        expect.objectContaining({
+          results: [
+            { success: false, status: 500, error: 'Internal server error', details: 'Something went wrong' }
+          ]
+        })
+      );
+    });
+
+    it('should report invalid entries without failing the batch', async () => {
+      const mockExchange = (controller as any).exchange;
+      mockExchange.fetchOHLCV.mockResolvedValue([
+        [1704412800000, 42000, 42500, 41500, 42200, 1000]
+      ]);
+
+      const { Backtester } = require('../trading/Backtester');
+      Backtester.mockImplementation(() => ({
+        loadData: jest.fn(),
+        startBacktest: jest.fn().mockResolvedValue({ totalReturn: 100 })
+      }));
+
+      const validEntry = { ...mockReq.body, startDate: '2024-01-05T00:00:00Z', endDate: '2024-01-06T00:00:00Z' };
+      mockReq.body = {
+        requests: [validEntry, { ...validEntry, timeframe: '2m' }]
+      };
+
+      await controller.runBacktestBatch(mockReq, mockRes);
+
+      expect(mockRes.status).not.toHaveBeenCalled();
+      expect(mockRes.json).toHaveBeenCalledWith(
+        expect.objectContaining({
+          results: [
+            { success: true, result: expect.objectContaining({ totalReturn: 100 }) },
+            expect.objectContaining({ success: false, status: 400, error: 'Validation error' })
+          ]
+        })
+      );
+    });
+
+    it('should reject an empty batch', async () => {
+      mockReq.body = { requests: [] };
+
+      await controller.runBacktestBatch(mockReq, mockRes);
+
+      expect(mockRes.status).toHaveBeenCalledWith(400);
+    });
+  });
+
+  describe('OHLCV cache', () => {
+    const fetchRange = (i: number) => {
+      const start = new Date(Date.UTC(2030, 0, 1) + i * 60 * 60 * 1000);
+      const end = new Date(start.getTime() + 30 * 60 * 1000);
+      return (controller as any).fetchOHLCVData('BTC/USDT', '15m', start, end);
+    };
+
+    beforeEach(() => {
+      const mockExchange = (controller as any).exchange;
+      mockExchange.fetchOHLCV.mockResolvedValue([
+        [1704067200000, 42000, 42500, 41500, 42200, 1000]
+      ]);
+    });
+
+    it('should serve repeated ranges from the cache', async () => {
+      const mockExchange = (controller as any).exchange;
+
+      await fetchRange(-1);
+      await fetchRange(-1);
+
+      expect(mockExchange.fetchOHLCV).toHaveBeenCalledTimes(1);
+    });
+
+    it('should evict the least recently used range beyond 256 entries', async () => {
+      const mockExchange = (controller as any).exchange;
+
+      // Fill the cache with 256 fresh ranges, pushing out anything older
+      for (let i = 0; i < 256; i++) {
+        await fetchRange(i);
+      }
+      await fetchRange(0); // hit: range 0 becomes most recently used
+      await fetchRange(256); // miss: evicts range 1, the least recently used
+      expect(mockExchange.fetchOHLCV).toHaveBeenCalledTimes(257);
+
+      await fetchRange(0);
+      expect(mockExchange.fetchOHLCV).toHaveBeenCalledTimes(257);
+
+      await fetchRange(1);
+      expect(mockExchange.fetchOHLCV).toHaveBeenCalledTimes(258);
+    });
+  });
+
   describe('getAvailableSymbols', () => {
     it('should return available trading symbols', async () => {
       const mockMarkets = {
@@ -1,19 +1,51 @@
 # stress_test_drawdown.py
 """
 Simulate rapid market moves and test risk enforcement for drawdown limits.
+
+Fires concurrent risk assessment requests so drawdown enforcement is
+exercised under load rather than one request at a time.
 """
-import requests
-import time
+import argparse
+import asyncio
+
+import aiohttp
 
 API_URL = 'http://localhost:3000/api/portfolios/{portfolio_id}/risk/assessment'
 
-# Simulate a series of equity drops
-portfolio_id = 'YOUR_PORTFOLIO_ID'
-for i in range(10):
+
+async def hit(session, url):
     # Simulate a drawdown event (replace with actual API or DB update in real test)
     # Here, just call the risk assessment endpoint
-    resp = requests.get(API_URL.format(portfolio_id=portfolio_id))
-    print(f'Assessment {i+1}:', resp.json())
-    time.sleep(0.5)
+    async with session.get(url) as resp:
+        return await resp.json()
+
+
+async def run(portfolio_id, requests, rounds, delay):
+    url = API_URL.format(portfolio_id=portfolio_id)
+    async with aiohttp.ClientSession() as session:
+        for round_no in range(rounds):
+            results = await asyncio.gather(
+                *[hit(session, url) for _ in range(requests)],
+                return_exceptions=True,
+            )
+            for i, result in enumerate(results):
+                print(f'Round {round_no + 1} assessment {i + 1}:', result)
+            if delay and round_no < rounds - 1:
+                await asyncio.sleep(delay)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--portfolio-id', default='YOUR_PORTFOLIO_ID')
+    parser.add_argument('--requests', type=int, default=10, help='concurrent requests per round')
+    parser.add_argument('--rounds', type=int, default=1, help='number of rounds to fire')
+    parser.add_argument('--delay', type=float, default=0.0, help='seconds to wait between rounds')
+    args = parser.parse_args()
+
+    asyncio.run(run(args.portfolio_id, args.requests, args.rounds, args.delay))
+
+
+if __name__ == '__main__':
+    main()
 
 # In a real test, you would also POST fake trades or update equity to trigger drawdown
@@ -0,0 +1,143 @@
+import { technicalIndicators } from '../utils/technicalIndicators';
+import { sma, standardDeviation, highest, lowest } from '../utils/indicators/base';
+
+// Reference slice-and-sum implementation the running-sum SMA must match
+const referenceSMA = (values: number[], period: number): number[] => {
+  const result: number[] = [];
+  for (let i = period - 1; i < values.length; i++) {
+    const sum = values.slice(i - period + 1, i + 1).reduce((a, b) => a + b, 0);
+    result.push(sum / period);
+  }
+  return result;
+};
+
+const expectSameSeries = (actual: number[], expected: number[]) => {
+  expect(actual).toHaveLength(expected.length);
+  actual.forEach((value, i) => {
+    if (Number.isNaN(expected[i]) || !Number.isFinite(expected[i])) {
+      expect(value).toBe(expected[i]);
+    } else {
+      expect(value).toBeCloseTo(expected[i], 9);
+    }
+  });
+};
+
+describe('SMA', () => {
+  it('should match the slice-based SMA on finite data', () => {
+    const values = Array.from({ length: 200 }, (_, i) => 100 + Math.sin(i / 5) * 10 + i * 0.1);
+
+    [1, 2, 14, 50, 200].forEach(period => {
+      expectSameSeries(sma(values, period), referenceSMA(values, period));
+    });
+  });
+
+  it('should only affect windows that contain a non-finite value', () => {
+    const values = [10, 20, NaN, 30, 40, 50, 60];
+
+    expect(sma(values, 3)).toEqual([NaN, NaN, NaN, 40, 50]);
+    expectSameSeries(sma(values, 2), referenceSMA(values, 2));
+  });
+
+  it('should match the slice-based SMA with Infinity in the series', () => {
+    const values = [1, 2, Infinity, 4, 5, -Infinity, 7, 8, 9];
+
+    [2, 3].forEach(period => {
+      expectSameSeries(sma(values, period), referenceSMA(values, period));
+    });
+  });
+
+  it('should return an empty series when there is not enough data', () => {
+    expect(sma([1, 2], 3)).toEqual([]);
+  });
+});
+
+// Slice-based references for the rolling-window indicators
+const referenceHighest = (values: number[], period: number): number[] =>
+  values.slice(period - 1).map((_, k) => Math.max(...values.slice(k, k + period)));
+
+const referenceLowest = (values: number[], period: number): number[] =>
+  values.slice(period - 1).map((_, k) => Math.min(...values.slice(k, k + period)));
+
+const referenceStdDev = (values: number[], period: number): number[] =>
+  referenceSMA(values, period).map((mean, i) =>
+    Math.sqrt(values.slice(i, i + period).reduce((sum, v) => sum + Math.pow(v - mean, 2), 0) / period)
+  );
+
+const referenceMeanDeviation = (values: number[], period: number): number[] =>
+  referenceSMA(values, period).map((mean, i) =>
+    values.slice(i, i + period).reduce((sum, v) => sum + Math.abs(v - mean), 0) / period
+  );
+
+describe('rolling-window indicators', () => {
+  const length = 120;
+  const close = Array.from({ length }, (_, i) => 100 + Math.sin(i / 7) * 8 + Math.cos(i / 3) * 2);
+  const high = close.map((c, i) => c + 1 + (i % 5) * 0.3);
+  const low = close.map((c, i) => c - 1 - (i % 4) * 0.2);
+
+  const withNaN = (values: number[]) => values.map((v, i) => (i === 30 || i === 31 || i === 90 ? NaN : v));
+  const datasets = [
+    ['finite data', close, high, low],
+    ['data containing NaN', withNaN(close), withNaN(high), withNaN(low)],
+  ] as const;
+
+  describe.each(datasets)('on %s', (_name, closeValues, highValues, lowValues) => {
+    const closes = [...closeValues];
+    const highs = [...highValues];
+    const lows = [...lowValues];
+
+    it('highest/lowest should match Math.max/Math.min over each window', () => {
+      [1, 5, 14].forEach(period => {
+        expectSameSeries(highest(highs, period), referenceHighest(highs, period));
+        expectSameSeries(lowest(lows, period), referenceLowest(lows, period));
+      });
+    });
+
+    it('standardDeviation should match the slice-based calculation', () => {
+      [2, 20].forEach(period => {
+        expectSameSeries(standardDeviation(closes, period), referenceStdDev(closes, period));
+      });
+    });
+
+    it('BollingerBands should match the slice-based calculation', () => {
+      const { upper, middle, lower } = technicalIndicators.BollingerBands(closes, 20, 2);
+      const mean = referenceSMA(closes, 20);
+      const std = referenceStdDev(closes, 20);
+
+      expectSameSeries(middle, mean);
+      expectSameSeries(upper, mean.map((m, i) => m + std[i] * 2));
+      expectSameSeries(lower, mean.map((m, i) => m - std[i] * 2));
+    });
+
+    it('CCI should match the slice-based calculation', () => {
+      const typical = highs.map((h, i) => (h + lows[i] + closes[i]) / 3);
+      const mean = referenceSMA(typical, 20);
+      const expected = referenceMeanDeviation(typical, 20).map((deviation, i) =>
+        deviation === 0 ? 0 : (typical[i + 19] - mean[i]) / (0.015 * deviation)
+      );
+
+      expectSameSeries(technicalIndicators.CCI(highs, lows, closes, 20), expected);
+    });
+
+    it('Stochastic and Williams %R should match the slice-based calculation', () => {
+      const highestHigh = referenceHighest(highs, 14);
+      const lowestLow = referenceLowest(lows, 14);
+      const expectedK = highestHigh.map((hh, k) =>
+        hh === lowestLow[k] ? 50 : ((closes[k + 13] - lowestLow[k]) / (hh - lowestLow[k])) * 100
+      );
+      const expectedWilliams = highestHigh.map((hh, k) =>
+        hh === lowestLow[k] ? -50 : ((hh - closes[k + 13]) / (hh - lowestLow[k])) * -100
+      );
+
+      const { k, d } = technicalIndicators.Stochastic(highs, lows, closes, 14, 3);
+      expectSameSeries(k, expectedK);
+      expectSameSeries(d, referenceSMA(expectedK, 3));
+      expectSameSeries(technicalIndicators.Williams(highs, lows, closes, 14), expectedWilliams);
+    });
+  });
+
+  it('highest/lowest should return NaN wherever the window holds a NaN', () => {
+    expect(highest([NaN, 1, 2], 3)).toEqual([NaN]);
+    expect(highest([1, 2, NaN], 3)).toEqual([NaN]);
+    expect(lowest([1, NaN, 2, 3], 2)).toEqual([NaN, NaN, 2]);
+  });
+});
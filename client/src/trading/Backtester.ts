@@ -5,6 +5,22 @@ import { OrderExecutor, OrderIntent, Order, ExecutorConfig } from './OrderExecut
 import { RiskManager, RiskConfig, RiskMetrics } from './RiskManager';
 import Logger from '../utils/logger';
 
+const MS_PER_DAY = 24 * 60 * 60 * 1000;
+
+// Candle interval in milliseconds for each supported timeframe
+export const TIMEFRAME_MS: { [key: string]: number } = {
+  '1m': 60 * 1000,
+  '5m': 5 * 60 * 1000,
+  '15m': 15 * 60 * 1000,
+  '30m': 30 * 60 * 1000,
+  '1h': 60 * 60 * 1000,
+  '4h': 4 * 60 * 60 * 1000,
+  '1d': MS_PER_DAY,
+};
+// At max replay speed, yield to the event loop every N candles so a long
+// backtest does not block other requests (server) or rendering (browser)
+const EVENT_LOOP_YIELD_INTERVAL = 500;
+
 export interface BacktestConfig {
   startDate: Date;
   endDate: Date;
@@ -58,6 +74,8 @@ export interface BacktestTrade {
   pnlPercent?: number;
   commission: number;
   signal: StrategySignal;
+  stopLoss?: number;
+  takeProfit?: number;
   duration?: number; // in milliseconds
   status: 'open' | 'closed';
 }
@@ -77,11 +95,14 @@ export class Backtester {
   private orderExecutor: OrderExecutor;
   private riskManager: RiskManager;
   private config: BacktestConfig;
+  private readonly symbol: string;
   private candles: CandleData[] = [];
   private currentIndex = 0;
   private equity: Array<{ timestamp: number; value: number }> = [];
   private trades: BacktestTrade[] = [];
   private openTrades = new Map<string, BacktestTrade>();
+  private realizedPnL = 0;
+  private peakEquity = 0;
   private progressSubject = new Subject<BacktestProgress>();
   private isRunning = false;
   private isPaused = false;
@@ -89,6 +110,7 @@ export class Backtester {
 
   constructor(config: BacktestConfig) {
     this.config = config;
+    this.symbol = config.symbol || 'BTC/USDT';
     this.candleIntervalMs = this.getIntervalInMs(config.timeframe || '15m');
     this.strategyRunner = new StrategyRunner(config.strategy);
     this.orderExecutor = new OrderExecutor({
@@ -104,17 +126,7 @@ export class Backtester {
    * Convert timeframe string to milliseconds
    */
   private getIntervalInMs(timeframe: string): number {
-    const timeframeMap: { [key: string]: number } = {
-      '1m': 60 * 1000,
-      '5m': 5 * 60 * 1000,
-      '15m': 15 * 60 * 1000,
-      '30m': 30 * 60 * 1000,
-      '1h': 60 * 60 * 1000,
-      '4h': 4 * 60 * 60 * 1000,
-      '1d': 24 * 60 * 60 * 1000,
-    };
-    
-    return timeframeMap[timeframe] || 15 * 60 * 1000; // Default to 15 minutes
+    return TIMEFRAME_MS[timeframe] || 15 * 60 * 1000; // Default to 15 minutes
   }
 
   /**
@@ -127,35 +139,44 @@ export class Backtester {
       this.candles = data;
     }
 
-    // Validate candles data
-    this.candles = this.candles.filter(candle => {
+    // Validate candles and filter by date range in a single pass
+    const requiredFields = ['timestamp', 'open', 'high', 'low', 'close', 'volume'];
+    const startTime = this.config.startDate.getTime();
+    const endTime = this.config.endDate.getTime();
+    const validCandles: CandleData[] = [];
+    let isSorted = true;
+
+    for (const candle of this.candles) {
       if (!candle || typeof candle !== 'object') {
         console.warn('Invalid candle object:', candle);
-        return false;
+        continue;
       }
-      
-      const requiredFields = ['timestamp', 'open', 'high', 'low', 'close', 'volume'];
+
       const isValid = requiredFields.every(field => {
         const value = candle[field as keyof CandleData];
         return typeof value === 'number' && !isNaN(value);
       });
-      
+
       if (!isValid) {
         console.warn('Invalid candle data:', candle);
-        return false;
+        continue;
       }
-      
-      return true;
-    });
 
-    // Filter data by date range
-    this.candles = this.candles.filter(candle => {
-      const candleDate = new Date(candle.timestamp);
-      return candleDate >= this.config.startDate && candleDate <= this.config.endDate;
-    });
+      if (candle.timestamp < startTime || candle.timestamp > endTime) {
+        continue;
+      }
 
-    // Sort candles by timestamp to ensure proper order
-    this.candles.sort((a, b) => a.timestamp - b.timestamp);
+      if (validCandles.length > 0 && candle.timestamp < validCandles[validCandles.length - 1].timestamp) {
+        isSorted = false;
+      }
+      validCandles.push(candle);
+    }
+
+    // Exchange feeds are normally already ordered, so only sort when needed
+    if (!isSorted) {
+      validCandles.sort((a, b) => a.timestamp - b.timestamp);
+    }
+    this.candles = validCandles;
 
     // Check if we have any candles after filtering
     if (this.candles.length === 0) {
@@ -182,6 +203,8 @@ export class Backtester {
     this.equity = [{ timestamp: this.candles[0].timestamp, value: this.config.initialBalance }];
     this.trades = [];
     this.openTrades.clear();
+    this.realizedPnL = 0;
+    this.peakEquity = this.config.initialBalance;
 
     console.log('Starting backtest...');
 
@@ -210,6 +233,8 @@ export class Backtester {
             // Control replay speed
             if (this.config.replaySpeed < 1000) {
               await new Promise(resolve => setTimeout(resolve, 1000 / this.config.replaySpeed));
+            } else if (this.currentIndex % EVENT_LOOP_YIELD_INTERVAL === 0) {
+              await new Promise(resolve => setTimeout(resolve, 0));
             }
           }
 
@@ -277,13 +302,13 @@ export class Backtester {
     // Update strategy with new candle
     this.strategyRunner.updateCandle(candle);
 
-    // Generate technical indicators and update strategy
-    this.updateIndicators();
-
     // Update current equity
     const currentEquity = this.calculateCurrentEquity(candle.close);
     // Use candle timestamp + interval to ensure strictly increasing timestamps
     this.equity.push({ timestamp: candle.timestamp + this.candleIntervalMs, value: currentEquity });
+    if (currentEquity > this.peakEquity) {
+      this.peakEquity = currentEquity;
+    }
 
     // Check for exit conditions on open trades
     this.checkExitConditions(candle);
@@ -292,65 +317,13 @@ export class Backtester {
     this.riskManager.updateAccountBalance(currentEquity);
   }
 
-  /**
-   * Update technical indicators for strategy
-   */
-  private updateIndicators(): void {
-    if (this.candles.length < 50) return; // Need enough data for indicators
-    
-    // Get recent candles for indicator calculation
-    const recentCandles = this.candles.slice(Math.max(0, this.currentIndex - 200), this.currentIndex + 1);
-    
-    // Import and use technical indicators
-    import('../utils/technicalIndicators').then(({ generateAllIndicators }) => {
-      const indicators = generateAllIndicators(recentCandles);
-      
-      // Update strategy runner with indicator signals
-      Object.entries(indicators).forEach(([name, indicator]) => {
-        if (indicator.values.length > 0) {
-          const latestValue = Array.isArray(indicator.values) 
-            ? indicator.values[indicator.values.length - 1]
-            : indicator.values;
-          
-          this.strategyRunner.updateIndicatorSignal(name, {
-            values: latestValue,
-            signals: this.generateSignalFromIndicator(name, latestValue)
-          });
-        }
-      });
-    }).catch(error => {
-      console.warn('Failed to update indicators:', error);
-    });
-  }
-
-  /**
-   * Generate trading signal from indicator value
-   */
-  private generateSignalFromIndicator(name: string, value: any): ('buy' | 'sell' | 'neutral')[] {
-    switch (name) {
-      case 'RSI':
-        if (typeof value === 'number') {
-          if (value < 30) return ['buy'];
-          if (value > 70) return ['sell'];
-        }
-        break;
-      case 'MACD':
-        if (typeof value === 'object' && value.histogram !== undefined) {
-          if (value.histogram > 0) return ['buy'];
-          if (value.histogram < 0) return ['sell'];
-        }
-        break;
-    }
-    return ['neutral'];
-  }
-
   /**
    * Setup event handlers for strategy signals and order execution
    */
   private setupEventHandlers(): void {
     // Listen for strategy signals
-    this.strategyRunner.getStrategySignals().subscribe((signal: any) => {
-      if (signal.type !== 'HOLD') {
+    this.strategyRunner.getStrategySignals().subscribe((signal: StrategySignal) => {
+      if (signal.action !== 'HOLD') {
         this.handleStrategySignal(signal);
       }
     });
@@ -371,19 +344,15 @@ export class Backtester {
       return;
     }
 
-    // Set symbol from config if not in signal
-    const symbol = signal.metadata.symbol || this.config.symbol || 'BTC/USDT';
-
-    // Create order intent
+    // Create order intent. StrategySignal carries no stop-loss/take-profit
+    // levels, so trades without them exit on the time limit or at the end
     const orderIntent: OrderIntent = {
       id: `backtest_${Date.now()}_${Math.random().toString(36).substr(2, 9)}`,
       signal,
-      symbol,
-      side: signal.type === 'LONG' ? 'buy' : 'sell',
+      symbol: this.symbol,
+      side: signal.action === 'BUY' ? 'buy' : 'sell',
       amount: 0, // Will be calculated by risk manager
       price: currentCandle.close,
-      stopLoss: signal.metadata.stopLoss,
-      takeProfit: signal.metadata.takeProfit,
       timestamp: currentCandle.timestamp,
     };
 
@@ -422,6 +391,8 @@ export class Backtester {
         quantity: order.executedAmount,
         commission: order.fees + (order.executedAmount * order.executedPrice * this.config.commission),
         signal: order.intent.signal,
+        stopLoss: order.intent.stopLoss,
+        takeProfit: order.intent.takeProfit,
         status: 'open',
       };
 
@@ -446,28 +417,28 @@ export class Backtester {
       let exitPrice = candle.close;
 
       // Check stop loss
-      if (trade.signal.metadata.stopLoss) {
-        if (trade.side === 'buy' && candle.low <= trade.signal.metadata.stopLoss) {
+      if (trade.stopLoss) {
+        if (trade.side === 'buy' && candle.low <= trade.stopLoss) {
           shouldExit = true;
           exitReason = 'stop_loss';
-          exitPrice = trade.signal.metadata.stopLoss;
-        } else if (trade.side === 'sell' && candle.high >= trade.signal.metadata.stopLoss) {
+          exitPrice = trade.stopLoss;
+        } else if (trade.side === 'sell' && candle.high >= trade.stopLoss) {
           shouldExit = true;
           exitReason = 'stop_loss';
-          exitPrice = trade.signal.metadata.stopLoss;
+          exitPrice = trade.stopLoss;
         }
       }
 
       // Check take profit
-      if (!shouldExit && trade.signal.metadata.takeProfit) {
-        if (trade.side === 'buy' && candle.high >= trade.signal.metadata.takeProfit) {
+      if (!shouldExit && trade.takeProfit) {
+        if (trade.side === 'buy' && candle.high >= trade.takeProfit) {
           shouldExit = true;
           exitReason = 'take_profit';
-          exitPrice = trade.signal.metadata.takeProfit;
-        } else if (trade.side === 'sell' && candle.low <= trade.signal.metadata.takeProfit) {
+          exitPrice = trade.takeProfit;
+        } else if (trade.side === 'sell' && candle.low <= trade.takeProfit) {
           shouldExit = true;
           exitReason = 'take_profit';
-          exitPrice = trade.signal.metadata.takeProfit;
+          exitPrice = trade.takeProfit;
         }
       }
 
@@ -516,6 +487,9 @@ export class Backtester {
 
     // Move to closed trades
     this.trades.push(trade);
+    if (!isNaN(pnlAfterCommission)) {
+      this.realizedPnL += pnlAfterCommission;
+    }
     this.openTrades.delete(tradeId);
 
     // Update risk manager
@@ -540,14 +514,8 @@ export class Backtester {
       return this.config.initialBalance;
     }
 
-    let equity = this.config.initialBalance;
-    
-    // Add realized PnL from closed trades
-    this.trades.forEach(trade => {
-      if (trade.pnl && typeof trade.pnl === 'number' && !isNaN(trade.pnl)) {
-        equity += trade.pnl;
-      }
-    });
+    // Realized PnL is accumulated as trades close
+    let equity = this.config.initialBalance + this.realizedPnL;
 
     // Add unrealized PnL from open trades
     this.openTrades.forEach(trade => {
@@ -575,7 +543,7 @@ export class Backtester {
     }
     
     const currentEquity = this.calculateCurrentEquity(currentCandle.close);
-    const peak = Math.max(...this.equity.map(e => e.value));
+    const peak = Math.max(this.peakEquity, currentEquity);
     const currentDrawdown = (currentEquity - peak) / peak;
 
     this.progressSubject.next({
@@ -610,20 +578,33 @@ export class Backtester {
       }
     });
 
-    // Calculate trade statistics
-    const winningTrades = this.trades.filter(t => (t.pnl || 0) > 0);
-    const losingTrades = this.trades.filter(t => (t.pnl || 0) < 0);
-    const winRate = this.trades.length > 0 ? (winningTrades.length / this.trades.length) * 100 : 0;
+    // Calculate trade statistics in a single pass over trade PnL
+    let winningTrades = 0;
+    let losingTrades = 0;
+    let totalWins = 0;
+    let grossLoss = 0;
+    let largestWin = 0;
+    let largestLoss = 0;
+
+    for (const trade of this.trades) {
+      const pnl = trade.pnl || 0;
+      if (pnl > 0) {
+        winningTrades++;
+        totalWins += pnl;
+        if (pnl > largestWin) largestWin = pnl;
+      } else if (pnl < 0) {
+        losingTrades++;
+        grossLoss += pnl;
+        if (pnl < largestLoss) largestLoss = pnl;
+      }
+    }
 
-    const totalWins = winningTrades.reduce((sum, t) => sum + (t.pnl || 0), 0);
-    const totalLosses = Math.abs(losingTrades.reduce((sum, t) => sum + (t.pnl || 0), 0));
+    const winRate = this.trades.length > 0 ? (winningTrades / this.trades.length) * 100 : 0;
+    const totalLosses = Math.abs(grossLoss);
     const profitFactor = totalLosses > 0 ? totalWins / totalLosses : totalWins > 0 ? Infinity : 0;
 
-    const averageWin = winningTrades.length > 0 ? totalWins / winningTrades.length : 0;
-    const averageLoss = losingTrades.length > 0 ? totalLosses / losingTrades.length : 0;
-
-    const largestWin = winningTrades.length > 0 ? Math.max(...winningTrades.map(t => t.pnl || 0)) : 0;
-    const largestLoss = losingTrades.length > 0 ? Math.min(...losingTrades.map(t => t.pnl || 0)) : 0;
+    const averageWin = winningTrades > 0 ? totalWins / winningTrades : 0;
+    const averageLoss = losingTrades > 0 ? totalLosses / losingTrades : 0;
 
     // Calculate daily returns for Sharpe ratio
     const dailyReturns = this.calculateDailyReturns();
@@ -640,14 +621,14 @@ export class Backtester {
       winRate,
       profitFactor,
       totalTrades: this.trades.length,
-      winningTrades: winningTrades.length,
-      losingTrades: losingTrades.length,
+      winningTrades,
+      losingTrades,
       averageWin,
       averageLoss,
       largestWin,
       largestLoss,
-      consecutiveWins: this.calculateConsecutiveWins(),
-      consecutiveLosses: this.calculateConsecutiveLosses(),
+      consecutiveWins: this.calculateMaxConsecutive(pnl => pnl > 0),
+      consecutiveLosses: this.calculateMaxConsecutive(pnl => pnl < 0),
       timeInMarket: this.calculateTimeInMarket(),
       calmarRatio,
       sortinoRatio,
@@ -728,14 +709,21 @@ export class Backtester {
    * Calculate daily returns
    */
   private calculateDailyReturns(): number[] {
-    const dailyEquity = new Map<string, number>();
+    // Equity points are time-ordered, so the last point of each UTC day closes
+    // that day; bucket by integer day number instead of formatting date strings
+    const values: number[] = [];
+    let currentDay = NaN;
     
     this.equity.forEach(point => {
-      const date = new Date(point.timestamp).toDateString();
-      dailyEquity.set(date, point.value);
+      const day = Math.floor(point.timestamp / MS_PER_DAY);
+      if (day === currentDay) {
+        values[values.length - 1] = point.value;
+      } else {
+        values.push(point.value);
+        currentDay = day;
+      }
     });
 
-    const values = Array.from(dailyEquity.values());
     const returns: number[] = [];
     
     for (let i = 1; i < values.length; i++) {
@@ -780,33 +768,14 @@ export class Backtester {
   }
 
   /**
-   * Calculate consecutive wins
-   */
-  private calculateConsecutiveWins(): number {
-    let maxConsecutive = 0;
-    let current = 0;
-    
-    this.trades.forEach(trade => {
-      if ((trade.pnl || 0) > 0) {
-        current++;
-        maxConsecutive = Math.max(maxConsecutive, current);
-      } else {
-        current = 0;
-      }
-    });
-    
-    return maxConsecutive;
-  }
-
-  /**
-   * Calculate consecutive losses
+   * Calculate the longest run of consecutive trades matching a predicate
    */
-  private calculateConsecutiveLosses(): number {
+  private calculateMaxConsecutive(matches: (pnl: number) => boolean): number {
     let maxConsecutive = 0;
     let current = 0;
     
     this.trades.forEach(trade => {
-      if ((trade.pnl || 0) < 0) {
+      if (matches(trade.pnl || 0)) {
         current++;
         maxConsecutive = Math.max(maxConsecutive, current);
       } else {
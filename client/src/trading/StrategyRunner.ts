@@ -77,9 +77,9 @@ export class StrategyRunner {
   updateCandle(candle: CandleData): void {
     this.currentCandle = candle;
     this.candleHistory.push(candle);
-    // Keep only the last 500 candles for performance
+    // Keep only the last 500 candles for performance (trim in place)
     if (this.candleHistory.length > 500) {
-      this.candleHistory = this.candleHistory.slice(-500);
+      this.candleHistory.splice(0, this.candleHistory.length - 500);
     }
   }
 
@@ -145,16 +145,8 @@ export class StrategyRunner {
   }
 
   private generateSignalFromCandles(candles: CandleData[]): Signal {
-    const ohlcvData = candles.map(c => ({
-      timestamp: c.timestamp,
-      open: c.open,
-      high: c.high,
-      low: c.low,
-      close: c.close,
-      volume: c.volume
-    }));
-
-    return this.generateSignal(ohlcvData);
+    // CandleData already has the OHLCV shape, so no per-candle copy is needed
+    return this.generateSignal(candles);
   }
 
   initializeIndicators(data: CandleData[]): void {
@@ -400,6 +392,21 @@ export class StrategyRunner {
       }
     };
   }
+
+  static createMeanReversionStrategy(): StrategyConfig {
+    return {
+      name: 'Mean Reversion Strategy',
+      version: '1.0.0',
+      parameters: {
+        bb_period: 20,
+        bb_std_dev: 2,
+        rsi_period: 14,
+        rsi_oversold: 30,
+        rsi_overbought: 70,
+        signal_threshold: 0.65
+      }
+    };
+  }
 }
 
 export default StrategyRunner;
\ No newline at end of file
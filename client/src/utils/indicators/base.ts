@@ -17,13 +17,43 @@ export interface MultiValueIndicatorResult {
 }
 
 /**
- * Simple Moving Average
+ * Simple Moving Average (running window sum, O(1) per bar)
  */
 export function sma(data: number[], period: number): number[] {
-  const result: number[] = [];
-  for (let i = period - 1; i < data.length; i++) {
-    const sum = data.slice(i - period + 1, i + 1).reduce((a, b) => a + b, 0);
-    result.push(sum / period);
+  if (period <= 0 || data.length < period) return [];
+
+  // Running sum over finite values only. A window holding NaN/Infinity is
+  // summed directly, so a bad value only affects the windows that contain it.
+  const windowSum = (end: number): number => {
+    let total = 0;
+    for (let j = end - period + 1; j <= end; j++) {
+      total += data[j];
+    }
+    return total;
+  };
+
+  const result = new Array<number>(data.length - period + 1);
+  let sum = 0;
+  let nonFinite = 0;
+  for (let i = 0; i < data.length; i++) {
+    if (Number.isFinite(data[i])) {
+      sum += data[i];
+    } else {
+      nonFinite++;
+    }
+
+    if (i >= period) {
+      const leaving = data[i - period];
+      if (Number.isFinite(leaving)) {
+        sum -= leaving;
+      } else {
+        nonFinite--;
+      }
+    }
+
+    if (i >= period - 1) {
+      result[i - period + 1] = (nonFinite > 0 ? windowSum(i) : sum) / period;
+    }
   }
   return result;
 }
@@ -68,11 +98,13 @@ export function standardDeviation(data: number[], period: number): number[] {
   const smaValues = sma(data, period);
   
   for (let i = 0; i < smaValues.length; i++) {
-    const dataSlice = data.slice(i, i + period);
     const mean = smaValues[i];
-    const squaredDiffs = dataSlice.map(value => Math.pow(value - mean, 2));
-    const variance = squaredDiffs.reduce((sum, diff) => sum + diff, 0) / period;
-    result.push(Math.sqrt(variance));
+    let squaredDiffSum = 0;
+    for (let j = i; j < i + period; j++) {
+      const diff = data[j] - mean;
+      squaredDiffSum += diff * diff;
+    }
+    result.push(Math.sqrt(squaredDiffSum / period));
   }
   
   return result;
@@ -94,14 +126,37 @@ export function trueRange(high: number[], low: number[], close: number[]): numbe
   return tr;
 }
 
+/**
+ * Highest value in data[end - period + 1 .. end]; NaN if the window holds a NaN
+ */
+export function windowMax(data: number[], end: number, period: number): number {
+  let max = -Infinity;
+  for (let j = end - period + 1; j <= end; j++) {
+    if (Number.isNaN(data[j])) return NaN;
+    if (data[j] > max) max = data[j];
+  }
+  return max;
+}
+
+/**
+ * Lowest value in data[end - period + 1 .. end]; NaN if the window holds a NaN
+ */
+export function windowMin(data: number[], end: number, period: number): number {
+  let min = Infinity;
+  for (let j = end - period + 1; j <= end; j++) {
+    if (Number.isNaN(data[j])) return NaN;
+    if (data[j] < min) min = data[j];
+  }
+  return min;
+}
+
 /**
  * Highest value in period
  */
 export function highest(data: number[], period: number): number[] {
   const result: number[] = [];
   for (let i = period - 1; i < data.length; i++) {
-    const slice = data.slice(i - period + 1, i + 1);
-    result.push(Math.max(...slice));
+    result.push(windowMax(data, i, period));
   }
   return result;
 }
@@ -112,8 +167,7 @@ export function highest(data: number[], period: number): number[] {
 export function lowest(data: number[], period: number): number[] {
   const result: number[] = [];
   for (let i = period - 1; i < data.length; i++) {
-    const slice = data.slice(i - period + 1, i + 1);
-    result.push(Math.min(...slice));
+    result.push(windowMin(data, i, period));
   }
   return result;
 }
@@ -1,5 +1,7 @@
 
 // Browser-compatible technical indicators implementation
+import { sma, windowMax, windowMin } from './indicators/base';
+
 export interface OHLCV {
   open: number;
   high: number;
@@ -35,12 +37,7 @@ export interface TechnicalIndicators {
 
 // Simple Moving Average
 function SMA(values: number[], period: number): number[] {
-  const result: number[] = [];
-  for (let i = period - 1; i < values.length; i++) {
-    const sum = values.slice(i - period + 1, i + 1).reduce((a, b) => a + b, 0);
-    result.push(sum / period);
-  }
-  return result;
+  return sma(values, period);
 }
 
 // Exponential Moving Average
@@ -121,10 +118,13 @@ function BollingerBands(values: number[], period: number, stdDev: number) {
   const lower: number[] = [];
   
   for (let i = 0; i < sma.length; i++) {
-    const slice = values.slice(i, i + period);
     const mean = sma[i];
-    const variance = slice.reduce((sum, val) => sum + Math.pow(val - mean, 2), 0) / period;
-    const standardDeviation = Math.sqrt(variance);
+    let squaredDiffSum = 0;
+    for (let j = i; j < i + period; j++) {
+      const diff = values[j] - mean;
+      squaredDiffSum += diff * diff;
+    }
+    const standardDeviation = Math.sqrt(squaredDiffSum / period);
     
     middle.push(mean);
     upper.push(mean + (standardDeviation * stdDev));
@@ -139,8 +139,8 @@ function Stochastic(high: number[], low: number[], close: number[], kPeriod: num
   const k: number[] = [];
   
   for (let i = kPeriod - 1; i < close.length; i++) {
-    const highestHigh = Math.max(...high.slice(i - kPeriod + 1, i + 1));
-    const lowestLow = Math.min(...low.slice(i - kPeriod + 1, i + 1));
+    const highestHigh = windowMax(high, i, kPeriod);
+    const lowestLow = windowMin(low, i, kPeriod);
     
     if (highestHigh === lowestLow) {
       k.push(50);
@@ -215,9 +215,12 @@ function CCI(high: number[], low: number[], close: number[], period: number): nu
   const result: number[] = [];
   
   for (let i = 0; i < sma.length; i++) {
-    const slice = typicalPrices.slice(i, i + period);
     const mean = sma[i];
-    const meanDeviation = slice.reduce((sum, val) => sum + Math.abs(val - mean), 0) / period;
+    let absDiffSum = 0;
+    for (let j = i; j < i + period; j++) {
+      absDiffSum += Math.abs(typicalPrices[j] - mean);
+    }
+    const meanDeviation = absDiffSum / period;
     
     if (meanDeviation === 0) {
       result.push(0);
@@ -234,8 +237,8 @@ function Williams(high: number[], low: number[], close: number[], period: number
   const result: number[] = [];
   
   for (let i = period - 1; i < close.length; i++) {
-    const highestHigh = Math.max(...high.slice(i - period + 1, i + 1));
-    const lowestLow = Math.min(...low.slice(i - period + 1, i + 1));
+    const highestHigh = windowMax(high, i, period);
+    const lowestLow = windowMin(low, i, period);
     
     if (highestHigh === lowestLow) {
       result.push(-50);
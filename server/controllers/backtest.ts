@@ -2,13 +2,20 @@
 import { Request, Response } from 'express';
 import ccxt from 'ccxt';
 import { z } from 'zod';
-import { Backtester, BacktestConfig } from '../../client/src/trading/Backtester';
+import { Backtester, BacktestConfig, TIMEFRAME_MS } from '../../client/src/trading/Backtester';
 import { CandleData } from '../../client/src/types/trading';
-import { StrategyRunner } from '../../client/src/trading/StrategyRunner';
+import { StrategyRunner, StrategyConfig } from '../../client/src/trading/StrategyRunner';
 
 // In-memory cache for OHLCV data (replace with Redis in production)
 const ohlcvCache = new Map<string, { data: CandleData[]; timestamp: number }>();
 const CACHE_DURATION = 5 * 60 * 1000; // 5 minutes
+const MAX_CACHE_ENTRIES = 256; // Bound memory when clients sweep many symbols/ranges
+
+// Strategy factories keyed by request strategyName; unknown names fall back to the default
+const STRATEGY_FACTORIES = new Map<string, () => StrategyConfig>([
+  ['trend_following', StrategyRunner.createTrendFollowingStrategy],
+  ['mean_reversion', StrategyRunner.createMeanReversionStrategy],
+]);
 
 const backtestRequestSchema = z.object({
   symbol: z.string().min(1),
@@ -33,8 +40,47 @@ const backtestRequestSchema = z.object({
   commission: z.number().min(0).max(1).default(0.001)
 });
 
+const MAX_BATCH_SIZE = 20;
+
+// Upper bound on candles per backtest so a single request cannot exhaust memory
+const MAX_CANDLES = 100_000;
+
+const backtestBatchSchema = z.object({
+  // Entries are validated one by one so a malformed entry only fails itself
+  requests: z.array(z.unknown()).min(1).max(MAX_BATCH_SIZE)
+});
+
+type BacktestRequestData = z.infer<typeof backtestRequestSchema>;
+
+// Rejected request parameters, reported to the client as a 400
+class BacktestInputError extends Error {}
+
+/**
+ * Map a backtest failure to an HTTP status and client-safe body. Only input
+ * errors expose their message; unexpected errors are masked outside development.
+ */
+function describeBacktestError(error: any): { status: number; body: Record<string, any> } {
+  if (error instanceof BacktestInputError) {
+    return { status: 400, body: { error: error.message } };
+  }
+  if (error instanceof z.ZodError) {
+    return { status: 400, body: { error: 'Validation error', details: error.errors } };
+  }
+  if (error?.message?.includes('symbol')) {
+    return { status: 400, body: { error: 'Invalid trading symbol', details: error.message } };
+  }
+  return {
+    status: 500,
+    body: {
+      error: 'Internal server error',
+      details: process.env.NODE_ENV === 'development' ? error?.message : 'Something went wrong'
+    }
+  };
+}
+
 export class BacktestController {
   private exchange: ccxt.Exchange;
+  private pendingFetches = new Map<string, Promise<CandleData[]>>();
 
   constructor() {
     this.exchange = new ccxt.binance({
@@ -48,6 +94,19 @@ export class BacktestController {
     });
   }
 
+  /**
+   * Load exchange markets ahead of the first request. ccxt loads them lazily on
+   * the first fetchOHLCV call, which otherwise lands on the first backtest's latency.
+   */
+  public async warmUp(): Promise<void> {
+    try {
+      await this.exchange.loadMarkets();
+      console.log('Backtest exchange markets loaded');
+    } catch (error) {
+      console.warn('Failed to preload exchange markets:', error.message);
+    }
+  }
+
   private getCacheKey(symbol: string, timeframe: string, since: number, until: number): string {
     return `${symbol}_${timeframe}_${since}_${until}`;
   }
@@ -56,7 +115,26 @@ export class BacktestController {
     return Date.now() - timestamp < CACHE_DURATION;
   }
 
-  private async fetchOHLCVData(
+  private fetchOHLCVData(
+    symbol: string,
+    timeframe: string,
+    startDate: Date,
+    endDate: Date
+  ): Promise<CandleData[]> {
+    // Concurrent requests for the same history (e.g. a batch sweep) share one download
+    const cacheKey = this.getCacheKey(symbol, timeframe, startDate.getTime(), endDate.getTime());
+    const pending = this.pendingFetches.get(cacheKey);
+    if (pending) {
+      return pending;
+    }
+
+    const download = this.loadOHLCVData(symbol, timeframe, startDate, endDate)
+      .finally(() => this.pendingFetches.delete(cacheKey));
+    this.pendingFetches.set(cacheKey, download);
+    return download;
+  }
+
+  private async loadOHLCVData(
     symbol: string,
     timeframe: string,
     startDate: Date,
@@ -66,11 +144,15 @@ export class BacktestController {
     const until = endDate.getTime();
     const cacheKey = this.getCacheKey(symbol, timeframe, since, until);
 
-    // Check cache first
+    // Check cache first; re-insert on hit so Map order tracks recency (LRU)
     const cached = ohlcvCache.get(cacheKey);
-    if (cached && this.isCacheValid(cached.timestamp)) {
-      console.log(`Using cached OHLCV data for ${symbol} ${timeframe}`);
-      return cached.data;
+    if (cached) {
+      ohlcvCache.delete(cacheKey);
+      if (this.isCacheValid(cached.timestamp)) {
+        ohlcvCache.set(cacheKey, cached);
+        console.log(`Using cached OHLCV data for ${symbol} ${timeframe}`);
+        return cached.data;
+      }
     }
 
     console.log(`Fetching OHLCV data for ${symbol} from ${startDate.toISOString()} to ${endDate.toISOString()}`);
@@ -88,19 +170,12 @@ export class BacktestController {
           break;
         }
 
-        // Convert to CandleData format
-        const candles = ohlcvs
-          .filter(ohlcv => ohlcv[0] <= until)
-          .map(ohlcv => ({
-            timestamp: ohlcv[0],
-            open: ohlcv[1],
-            high: ohlcv[2],
-            low: ohlcv[3],
-            close: ohlcv[4],
-            volume: ohlcv[5]
-          }));
-
-        allCandles.push(...candles);
+        // Convert to CandleData format in one pass; rows are time-ordered,
+        // so stop at the first one past the requested range
+        for (const [timestamp, open, high, low, close, volume] of ohlcvs) {
+          if (timestamp > until) break;
+          allCandles.push({ timestamp, open, high, low, close, volume });
+        }
 
         // Update for next iteration
         if (ohlcvs.length < limit) {
@@ -113,11 +188,15 @@ export class BacktestController {
         await new Promise(resolve => setTimeout(resolve, 100));
       }
 
-      // Cache the result
+      // Cache the result, evicting the least recently used entries
       ohlcvCache.set(cacheKey, {
         data: allCandles,
         timestamp: Date.now()
       });
+      while (ohlcvCache.size > MAX_CACHE_ENTRIES) {
+        const oldestKey = ohlcvCache.keys().next().value as string;
+        ohlcvCache.delete(oldestKey);
+      }
 
       console.log(`Fetched ${allCandles.length} candles for ${symbol} ${timeframe}`);
       return allCandles;
@@ -128,112 +207,135 @@ export class BacktestController {
     }
   }
 
-  public async runBacktest(req: Request, res: Response): Promise<void> {
-    try {
-      const validatedData = backtestRequestSchema.parse(req.body);
-      const { symbol, timeframe, startDate, endDate, strategyName, strategyConfig, initialBalance, commission } = validatedData;
+  private async executeBacktest(params: BacktestRequestData): Promise<Record<string, any>> {
+    const { symbol, timeframe, startDate, endDate, strategyName, strategyConfig, initialBalance, commission } = params;
 
-      // Validate date range
-      if (startDate >= endDate) {
-        res.status(400).json({ error: 'Start date must be before end date' });
-        return;
-      }
+    // Validate date range
+    if (startDate >= endDate) {
+      throw new BacktestInputError('Start date must be before end date');
+    }
 
-      const maxRange = 90 * 24 * 60 * 60 * 1000; // 90 days
-      if (endDate.getTime() - startDate.getTime() > maxRange) {
-        res.status(400).json({ error: 'Date range cannot exceed 90 days' });
-        return;
-      }
+    const maxRange = 90 * 24 * 60 * 60 * 1000; // 90 days
+    if (endDate.getTime() - startDate.getTime() > maxRange) {
+      throw new BacktestInputError('Date range cannot exceed 90 days');
+    }
 
-      // Fetch historical data
-      const candles = await this.fetchOHLCVData(symbol, timeframe, startDate, endDate);
+    // Reject oversized requests before downloading any history
+    const expectedCandles = Math.ceil((endDate.getTime() - startDate.getTime()) / TIMEFRAME_MS[timeframe]);
+    if (expectedCandles > MAX_CANDLES) {
+      throw new BacktestInputError(
+        `Backtest would process ~${expectedCandles} candles (limit ${MAX_CANDLES}). ` +
+        'Use a larger timeframe'
+      );
+    }
 
-      if (candles.length === 0) {
-        res.status(400).json({ error: 'No historical data available for the specified period' });
-        return;
-      }
+    // Fetch historical data
+    const candles = await this.fetchOHLCVData(symbol, timeframe, startDate, endDate);
 
-      // Create strategy based on name
-      let strategy;
-      switch (strategyName) {
-        case 'trend_following':
-          strategy = StrategyRunner.createTrendFollowingStrategy();
-          break;
-        case 'mean_reversion':
-          strategy = StrategyRunner.createMeanReversionStrategy();
-          break;
-        default:
-          strategy = StrategyRunner.createDefaultStrategy();
-      }
+    if (candles.length === 0) {
+      throw new BacktestInputError('No historical data available for the specified period');
+    }
 
-      // Configure backtester
-      const backtestConfig: BacktestConfig = {
-        symbol,
-        timeframe,
-        startDate,
-        endDate,
-        initialBalance,
-        commission,
-        strategy,
-        replaySpeed: 1000, // Max speed for backtesting
-        riskConfig: {
-          maxRiskPerTrade: strategyConfig.riskPercentage / 100,
-          maxDrawdown: 0.2,
-          maxPositions: strategyConfig.maxPositions,
-          stopLossPercentage: strategyConfig.stopLossPercentage / 100,
-          takeProfitPercentage: strategyConfig.takeProfitPercentage / 100
-        },
-        executorConfig: {
-          paperTrading: true,
-          slippageModel: {
-            type: 'percentage',
-            value: 0.001
-          }
+    // Create strategy based on name
+    const createStrategy = STRATEGY_FACTORIES.get(strategyName) ?? StrategyRunner.createDefaultStrategy;
+    const strategy = createStrategy();
+
+    // Configure backtester
+    const backtestConfig: BacktestConfig = {
+      symbol,
+      timeframe,
+      startDate,
+      endDate,
+      initialBalance,
+      commission,
+      strategy,
+      replaySpeed: 1000, // Max speed for backtesting
+      riskConfig: {
+        maxRiskPerTrade: strategyConfig.riskPercentage / 100,
+        maxDrawdown: 0.2,
+        maxPositions: strategyConfig.maxPositions,
+        stopLossPercentage: strategyConfig.stopLossPercentage / 100,
+        takeProfitPercentage: strategyConfig.takeProfitPercentage / 100
+      },
+      executorConfig: {
+        paperTrading: true,
+        slippageModel: {
+          type: 'percentage',
+          value: 0.001
         }
-      };
+      }
+    };
+
+    // Run backtest
+    const backtester = new Backtester(backtestConfig);
+    backtester.loadData(candles);
+    
+    const startTime = Date.now();
+    const result = await backtester.startBacktest();
+    const executionTime = Date.now() - startTime;
+
+    // Add execution metadata
+    return {
+      ...result,
+      executionTime,
+      candlesProcessed: candles.length,
+      symbol,
+      timeframe,
+      startDate: startDate.toISOString(),
+      endDate: endDate.toISOString(),
+      strategyName,
+      strategyConfig
+    };
+  }
 
-      // Run backtest
-      const backtester = new Backtester(backtestConfig);
-      backtester.loadData(candles);
-      
-      const startTime = Date.now();
-      const result = await backtester.startBacktest();
-      const executionTime = Date.now() - startTime;
-
-      // Add execution metadata
-      const response = {
-        ...result,
-        executionTime,
-        candlesProcessed: candles.length,
-        symbol,
-        timeframe,
-        startDate: startDate.toISOString(),
-        endDate: endDate.toISOString(),
-        strategyName,
-        strategyConfig
-      };
+  public async runBacktest(req: Request, res: Response): Promise<void> {
+    try {
+      const validatedData = backtestRequestSchema.parse(req.body);
+      const response = await this.executeBacktest(validatedData);
 
       res.json(response);
 
     } catch (error) {
       console.error('Backtest error:', error);
       
-      if (error instanceof z.ZodError) {
-        res.status(400).json({ 
-          error: 'Validation error', 
-          details: error.errors 
-        });
-      } else if (error.message.includes('symbol')) {
-        res.status(400).json({ 
-          error: 'Invalid trading symbol', 
-          details: error.message 
-        });
-      } else {
-        res.status(500).json({ 
-          error: 'Internal server error', 
-          details: process.env.NODE_ENV === 'development' ? error.message : 'Something went wrong' 
-        });
-      }
+      const { status, body } = describeBacktestError(error);
+      res.status(status).json(body);
+    }
+  }
+
+  /**
+   * Run several backtests (parameter sweep / multi-symbol) in one round-trip.
+   * Requests run concurrently so OHLCV downloads overlap, and requests over the
+   * same history share a single fetch. One failing entry does not fail the batch.
+   */
+  public async runBacktestBatch(req: Request, res: Response): Promise<void> {
+    try {
+      const { requests } = backtestBatchSchema.parse(req.body);
+
+      const startTime = Date.now();
+      const results = await Promise.all(
+        requests.map(async entry => {
+          try {
+            const params = backtestRequestSchema.parse(entry);
+            return { success: true, result: await this.executeBacktest(params) };
+          } catch (error) {
+            console.error('Batch backtest entry error:', error);
+            const { status, body } = describeBacktestError(error);
+            return { success: false, status, ...body };
+          }
+        })
+      );
+
+      res.json({
+        results,
+        executionTime: Date.now() - startTime
+      });
+
+    } catch (error) {
+      console.error('Batch backtest error:', error);
+
+      const { status, body } = describeBacktestError(error);
+      res.status(status).json(body);
     }
   }
 
@@ -7,13 +7,37 @@ import liveSimulationRoutes from "./liveSimulationRoutes";
 import manualTradingRoutes from "./manualTradingRoutes";
 import liveStrategyRoutes from './liveStrategyRoutes';
 import liveTradingRoutes from './liveTradingRoutes';
-import tradingRoutes from './tradingRoutes';
+import tradingRoutes, { backtestController } from './tradingRoutes';
 
 const app = express();
 app.use(express.json());
 app.use(express.urlencoded({ extended: false }));
 app.use(cookieParser());
 
+// Log lines are truncated to 80 chars, so only serialize the top level of a
+// response body; large payloads (equity curves, trade lists) are summarized
+// instead of being stringified a second time on every request.
+function summarizeForLog(body: unknown): string {
+  if (Array.isArray(body)) {
+    return `[${body.length} items]`;
+  }
+  if (body === null || typeof body !== "object") {
+    return JSON.stringify(body);
+  }
+
+  const preview: Record<string, unknown> = {};
+  for (const [key, value] of Object.entries(body)) {
+    if (Array.isArray(value)) {
+      preview[key] = `[${value.length} items]`;
+    } else if (value !== null && typeof value === "object") {
+      preview[key] = "{…}";
+    } else {
+      preview[key] = value;
+    }
+  }
+  return JSON.stringify(preview);
+}
+
 app.use((req, res, next) => {
   const start = Date.now();
   const path = req.path;
@@ -30,7 +54,7 @@ app.use((req, res, next) => {
     if (path.startsWith("/api")) {
       let logLine = `${req.method} ${path} ${res.statusCode} in ${duration}ms`;
       if (capturedJsonResponse) {
-        logLine += ` :: ${JSON.stringify(capturedJsonResponse)}`;
+        logLine += ` :: ${summarizeForLog(capturedJsonResponse)}`;
       }
 
       if (logLine.length > 80) {
@@ -81,5 +105,8 @@ app.use((req, res, next) => {
     reusePort: true,
   }, () => {
     log(`serving on port ${port}`);
+
+    // Preload exchange markets so the first backtest does not pay for it
+    void backtestController.warmUp();
   });
 })();
\ No newline at end of file
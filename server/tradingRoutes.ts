@@ -46,11 +46,14 @@ function initializeExchange(apiKey?: string, apiSecret?: string) {
 // Import the backtest controller
 import { BacktestController } from './controllers/backtest';
 
-const backtestController = new BacktestController();
+export const backtestController = new BacktestController();
 
 // Backtest endpoint with real market data
 router.post('/backtest', authenticateToken, backtestController.runBacktest.bind(backtestController));
 
+// Run multiple backtests (parameter sweeps, multi-symbol) in a single request
+router.post('/backtest/batch', authenticateToken, backtestController.runBacktestBatch.bind(backtestController));
+
 // Get available symbols endpoint
 router.get('/symbols', authenticateToken, backtestController.getAvailableSymbols.bind(backtestController));
 